@@ -4,18 +4,52 @@
 
 import os
 import sys
-import json
 import logging
 import asyncio
 import time
+import signal
+import importlib.util
 from datetime import datetime
 from pathlib import Path
 
+from io_helpers import ensure_dir, json_loads
+
+# (epoch second, "YYYY-MM-DD HH:MM:SS", "HH:MM:SS") from the last formatting
+_TS_CACHE = (None, "", "")
+
+def _cached_timestamps():
+    """Current local time in both display formats, reformatted at most once per wall-clock second"""
+    global _TS_CACHE
+    now = int(time.time())
+    if now != _TS_CACHE[0]:
+        full = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        _TS_CACHE = (now, full, full[11:])
+    return _TS_CACHE
+
+def _fast_ts():
+    """Current local time as YYYY-MM-DD HH:MM:SS"""
+    return _cached_timestamps()[1]
+
+# Shared Telegram bot, reused so notifications keep one HTTPS connection pool
+_BOT_SINGLETON = None
+
+def get_bot(token):
+    """Return the process-wide Telegram bot, rebuilding it only when the token changes"""
+    global _BOT_SINGLETON
+    if _BOT_SINGLETON is None or _BOT_SINGLETON.token != token:
+        from telegram import Bot
+        from telegram.request import HTTPXRequest
+        # PTB raises RuntimeError for http_version="2" without h2, so check for it up front
+        http_version = "2" if importlib.util.find_spec("h2") else "1.1"
+        request = HTTPXRequest(connection_pool_size=4, connect_timeout=5.0, read_timeout=5.0, http_version=http_version)
+        _BOT_SINGLETON = Bot(token=token, request=request)
+    return _BOT_SINGLETON
+
 # Setup logging first
 def setup_logging():
     """Setup logging"""
     log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    ensure_dir(log_dir)
     
     logging.basicConfig(
         level=logging.INFO,
@@ -30,11 +64,20 @@ def setup_logging():
 
 logger = setup_logging()
 
+# Parsed configuration files keyed by (path, mtime_ns, size)
+_CONFIG_CACHE = {}
+
 class SimpleEnhancedTradingSystem:
     """Simple Enhanced Trading System that definitely works"""
     
     def __init__(self):
         self.is_running = False
+        self._stop = asyncio.Event()
+        
+        # Per-minute market status cache for the main loop
+        self._market_cache_expiry = 0.0
+        self._market_open_cached = False
+        
         logger.info("🚀 Enhanced Trading System Initializing...")
         
         # Setup directories
@@ -43,6 +86,19 @@ class SimpleEnhancedTradingSystem:
         # Load config
         self.config = self.load_config()
         
+        # Flat copies of the values read on every loop, health check and notification
+        notifications = self.config.get("notifications", {})
+        self.paper_trading = self.config.get("system", {}).get("enable_paper_trading", True)
+        self.max_daily_trades = self.config.get("trading", {}).get("max_daily_trades", 10)
+        self.stop_loss_pct = self.config.get("risk_management", {}).get("stop_loss_percentage", 0.15)
+        self.tg_token = notifications.get("telegram_bot_token")
+        self.tg_chat = notifications.get("telegram_chat_id")
+        
+        # Fixed part of every health report; only timestamp and market status change
+        self._health_template = {"system_status": "✅ HEALTHY", "paper_trading": self.paper_trading}
+        self._status_open = "🟢 OPEN"
+        self._status_closed = "🔴 CLOSED"
+        
         logger.info("✅ System initialized successfully")
         print("✅ System initialized successfully")
     
@@ -50,7 +106,7 @@ class SimpleEnhancedTradingSystem:
         """Setup required directories"""
         directories = ["data", "logs", "reports", "config"]
         for directory in directories:
-            Path(directory).mkdir(exist_ok=True)
+            ensure_dir(directory)
         logger.info("✅ Directories created")
         print("✅ Directories created")
     
@@ -58,18 +114,24 @@ class SimpleEnhancedTradingSystem:
         """Load configuration"""
         try:
             config_file = Path("config/trading_settings.json")
-            if config_file.exists():
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                logger.info("✅ Configuration loaded")
-                print("✅ Configuration loaded")
-                return config
-            else:
-                logger.info("⚠️  Using default configuration")
-                print("⚠️  Using default configuration")
-                return self.get_default_config()
+            # Reuse the parsed config until the file changes on disk
+            stat = config_file.stat()
+            cache_key = (str(config_file), stat.st_mtime_ns, stat.st_size)
+            config = _CONFIG_CACHE.get(cache_key)
+            if config is None:
+                config = json_loads(config_file.read_bytes())
+                for stale_key in [key for key in _CONFIG_CACHE if key[0] == cache_key[0]]:
+                    del _CONFIG_CACHE[stale_key]
+                _CONFIG_CACHE[cache_key] = config
+            logger.info("✅ Configuration loaded")
+            print("✅ Configuration loaded")
+            return config
+        except FileNotFoundError:
+            logger.info("⚠️  Using default configuration")
+            print("⚠️  Using default configuration")
+            return self.get_default_config()
         except Exception as e:
-            logger.error(f"❌ Config error: {e}")
+            logger.error("❌ Config error: %s", e)
             print(f"❌ Config error: {e}")
             return self.get_default_config()
     
@@ -91,73 +153,75 @@ class SimpleEnhancedTradingSystem:
     
     def check_market_open(self):
         """Simple market check"""
+        # Hour-granular check, so a minute-old answer is still accurate enough
+        now_monotonic = time.monotonic()
+        if now_monotonic < self._market_cache_expiry:
+            return self._market_open_cached
+        
         try:
             now = datetime.now()
             # Simple check: Monday-Friday, 9 AM - 4 PM
-            if now.weekday() >= 5:  # Weekend
-                return False
-            if 9 <= now.hour <= 16:  # Market hours
-                return True
-            return False
+            market_open = now.weekday() < 5 and 9 <= now.hour <= 16
         except Exception as e:
-            logger.error(f"Market check error: {e}")
+            logger.error("Market check error: %s", e)
             return True  # Assume open if error
+        
+        self._market_open_cached = market_open
+        self._market_cache_expiry = now_monotonic + 60
+        return market_open
+    
+    def clock_str(self):
+        """Current time as HH:MM:SS, reformatted at most once per second"""
+        return _cached_timestamps()[2]
     
     def perform_health_check(self):
         """Perform system health check"""
         try:
             health_status = {
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "system_status": "✅ HEALTHY",
-                "paper_trading": self.config.get("system", {}).get("enable_paper_trading", True),
-                "market_status": "🟢 OPEN" if self.check_market_open() else "🔴 CLOSED"
+                **self._health_template,
+                "timestamp": _fast_ts(),
+                "market_status": self._status_open if self.check_market_open() else self._status_closed
             }
             
-            logger.info(f"Health Check: {health_status}")
-            print(f"📊 Health Check: {health_status['system_status']} | Market: {health_status['market_status']}")
+            logger.info("Health Check: %s", health_status)
             
             return health_status
             
         except Exception as e:
-            logger.error(f"Health check failed: {e}")
+            logger.error("Health check failed: %s", e)
             print(f"❌ Health check failed: {e}")
             return {"system_status": "❌ ERROR", "error": str(e)}
     
     async def send_startup_notification(self):
         """Send startup notification if Telegram is configured"""
         try:
-            # Check if telegram is configured
-            if not self.config.get("notifications", {}).get("telegram_bot_token"):
+            # Check if telegram is configured before building anything
+            if not self.tg_token or self.tg_token == "YOUR_TELEGRAM_BOT_TOKEN":
                 logger.info("📱 Telegram not configured - skipping notification")
                 print("📱 Telegram not configured - skipping notification")
                 return
             
-            # Try to send notification
-            from telegram import Bot
-            bot_token = self.config["notifications"]["telegram_bot_token"]
-            chat_id = self.config["notifications"]["telegram_chat_id"]
-            
-            if bot_token != "YOUR_TELEGRAM_BOT_TOKEN":
-                bot = Bot(token=bot_token)
-                message = f"""
+            # Send notification
+            bot = get_bot(self.tg_token)
+            message = f"""
 🚀 Enhanced Trading System Online
 
 ✅ Status: Running
-📊 Mode: {'Paper Trading' if self.config.get('system', {}).get('enable_paper_trading', True) else 'Live Trading'}
+📊 Mode: {'Paper Trading' if self.paper_trading else 'Live Trading'}
 ⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 🔧 Version: 2.0 Professional
 
 System is ready and monitoring!
 """
-                await bot.send_message(chat_id=chat_id, text=message)
-                logger.info("✅ Startup notification sent to Telegram")
-                print("✅ Startup notification sent to Telegram")
+            await bot.send_message(chat_id=self.tg_chat, text=message)
+            logger.info("✅ Startup notification sent to Telegram")
+            print("✅ Startup notification sent to Telegram")
             
         except ImportError:
             logger.info("📱 Telegram library not available")
             print("📱 Telegram library not available")
         except Exception as e:
-            logger.warning(f"📱 Telegram notification failed: {e}")
+            logger.warning("📱 Telegram notification failed: %s", e)
             print(f"📱 Telegram notification failed: {e}")
     
     async def main_loop(self):
@@ -166,6 +230,12 @@ System is ready and monitoring!
             self.is_running = True
             loop_count = 0
             
+            # Ctrl+C wakes the loop immediately instead of waiting out the sleep
+            try:
+                asyncio.get_running_loop().add_signal_handler(signal.SIGINT, self._stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Signal handlers are not supported by Windows event loops
+            
             logger.info("🔄 Starting main system loop...")
             print("🔄 Starting main system loop...")
             
@@ -180,28 +250,47 @@ System is ready and monitoring!
                 market_open = self.check_market_open()
                 
                 if market_open:
-                    logger.info("📈 Market is OPEN - Monitoring for opportunities...")
-                    print(f"📈 Market OPEN | Loop: {loop_count} | {datetime.now().strftime('%H:%M:%S')}")
+                    logger.info("📈 Market OPEN | Loop: %d | %s", loop_count, self.clock_str())
                     
                     # This is where actual trading logic would go
                     # For now, just log that we're monitoring
                     
                 else:
-                    logger.info("💤 Market is CLOSED - Waiting...")
-                    print(f"💤 Market CLOSED | Loop: {loop_count} | {datetime.now().strftime('%H:%M:%S')}")
+                    logger.info("💤 Market CLOSED | Loop: %d | %s", loop_count, self.clock_str())
                 
-                # Wait 30 seconds before next iteration
-                await asyncio.sleep(30)
+                # Wait 30 seconds before next iteration, or until shutdown is requested
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=30)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+            
+            # A second Ctrl+C should interrupt a stuck shutdown, not just set the event again
+            self._remove_sigint_handler()
+            
+            if self.is_running:
+                logger.info("🛑 Shutdown requested by user")
+                print("🛑 Shutdown requested by user")
+                await self.shutdown()
                 
         except KeyboardInterrupt:
             logger.info("🛑 Shutdown requested by user")
             print("🛑 Shutdown requested by user")
+            self._stop.set()
             await self.shutdown()
         except Exception as e:
-            logger.error(f"❌ Main loop error: {e}")
+            logger.error("❌ Main loop error: %s", e)
             print(f"❌ Main loop error: {e}")
+            self._remove_sigint_handler()
             await self.shutdown()
     
+    def _remove_sigint_handler(self):
+        """Hand Ctrl+C back to the default handler"""
+        try:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGINT)
+        except (NotImplementedError, RuntimeError):
+            pass  # Signal handlers are not supported by Windows event loops
+    
     async def shutdown(self):
         """Graceful shutdown"""
         try:
@@ -209,28 +298,24 @@ System is ready and monitoring!
             print("🔄 Shutting down Enhanced Trading System...")
             
             self.is_running = False
+            self._stop.set()
             
             # Send shutdown notification if configured
             try:
-                if self.config.get("notifications", {}).get("telegram_bot_token"):
-                    from telegram import Bot
-                    bot_token = self.config["notifications"]["telegram_bot_token"]
-                    chat_id = self.config["notifications"]["telegram_chat_id"]
-                    
-                    if bot_token != "YOUR_TELEGRAM_BOT_TOKEN":
-                        bot = Bot(token=bot_token)
-                        message = "🔴 Enhanced Trading System - Shutdown Complete"
-                        await bot.send_message(chat_id=chat_id, text=message)
-                        logger.info("✅ Shutdown notification sent")
-                        print("✅ Shutdown notification sent")
+                if self.tg_token and self.tg_token != "YOUR_TELEGRAM_BOT_TOKEN":
+                    bot = get_bot(self.tg_token)
+                    message = "🔴 Enhanced Trading System - Shutdown Complete"
+                    await bot.send_message(chat_id=self.tg_chat, text=message)
+                    logger.info("✅ Shutdown notification sent")
+                    print("✅ Shutdown notification sent")
             except Exception as e:
-                logger.warning(f"Shutdown notification failed: {e}")
+                logger.warning("Shutdown notification failed: %s", e)
             
             logger.info("✅ Enhanced Trading System shutdown complete")
             print("✅ Enhanced Trading System shutdown complete")
             
         except Exception as e:
-            logger.error(f"Error during shutdown: {e}")
+            logger.error("Error during shutdown: %s", e)
             print(f"Error during shutdown: {e}")
     
     async def start(self):
@@ -254,9 +339,9 @@ System is ready and monitoring!
             
             # Show system info
             print(f"\n📋 System Configuration:")
-            print(f"   • Paper Trading: {'✅ ENABLED' if self.config.get('system', {}).get('enable_paper_trading', True) else '❌ DISABLED'}")
-            print(f"   • Max Daily Trades: {self.config.get('trading', {}).get('max_daily_trades', 10)}")
-            print(f"   • Stop Loss: {self.config.get('risk_management', {}).get('stop_loss_percentage', 0.15)*100}%")
+            print(f"   • Paper Trading: {'✅ ENABLED' if self.paper_trading else '❌ DISABLED'}")
+            print(f"   • Max Daily Trades: {self.max_daily_trades}")
+            print(f"   • Stop Loss: {self.stop_loss_pct*100}%")
             
             print(f"\n🎯 System is now running! Press Ctrl+C to stop.")
             print("📊 Monitor the logs in logs/enhanced_trading_system.log")
@@ -266,7 +351,7 @@ System is ready and monitoring!
             await self.main_loop()
             
         except Exception as e:
-            logger.error(f"❌ System start error: {e}")
+            logger.error("❌ System start error: %s", e)
             print(f"❌ System start error: {e}")
             await self.shutdown()
 
@@ -279,7 +364,7 @@ async def main():
         await trading_system.start()
         
     except Exception as e:
-        logger.error(f"❌ Fatal error: {e}")
+        logger.error("❌ Fatal error: %s", e)
         print(f"❌ Fatal error: {e}")
         sys.exit(1)
 
@@ -287,9 +372,15 @@ if __name__ == "__main__":
     try:
         print("Starting Enhanced Trading System...")
         
-        # Windows compatibility
+        # Windows compatibility; libuv-based event loop elsewhere when available
         if os.name == 'nt':
             asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        else:
+            try:
+                import uvloop
+                asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            except ImportError:
+                pass
         
         # Run the system
         asyncio.run(main())
@@ -0,0 +1,34 @@
+# io_helpers.py - File and JSON helpers shared by main.py and enhanced_main.py
+
+import os
+import json
+
+try:
+    import orjson
+
+    def json_loads(data):
+        """Parse JSON from bytes or str"""
+        return orjson.loads(data)
+
+    def json_dumps(obj):
+        """Serialize obj to indented UTF-8 JSON bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def json_loads(data):
+        """Parse JSON from bytes or str"""
+        return json.loads(data)
+
+    def json_dumps(obj):
+        """Serialize obj to indented UTF-8 JSON bytes"""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+# Directories already created by this process
+_ENSURED_DIRS = set()
+
+def ensure_dir(path):
+    """Create a directory once per process, skipping the syscall on repeat calls"""
+    path = str(path)
+    if path in _ENSURED_DIRS:
+        return
+    os.makedirs(path, exist_ok=True)
+    _ENSURED_DIRS.add(path)
@@ -1,16 +1,20 @@
 import os
-import json
 import logging
 import asyncio
-import schedule
+import time
+import sqlite3
 import yfinance as yf
-import requests
+import aiohttp
 import nest_asyncio
 import shutil
-from datetime import datetime, timedelta, timezone
+from io_helpers import ensure_dir, json_loads, json_dumps
+from datetime import datetime, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
 from modules.auto_trader import scheduled_tasks
 from modules.auto_trader import IBKRConnection
 from modules.auto_trader import close_all_positions_before_market_close
+from modules.auto_trader import log_action  # يمكن استخدام نفس نظام التسجيل
 
 
 ib_connection: IBKRConnection = IBKRConnection()
@@ -24,9 +28,7 @@ from modules.tv_data import (
 )
 from modules.tv_data import analyze_high_movement_stocks
 from modules.notifier import send_telegram_message
-from modules.auto_trader import send_pnl_summary
-import schedule
-import asyncio
+from modules.auto_trader import send_pnl_summary, verify_active_stop_orders
 from modules.ml_model import train_model_daily
 from modules.symbols_updater import fetch_all_us_symbols, save_symbols_to_csv
 from modules.telegram_bot import start_telegram_bot
@@ -35,13 +37,43 @@ from modules.pump_detector import detect_pump_stocks
 from modules.price_tracker import check_targets, clean_old_trades
 #from modules.auto_trader import close_all_positions_before_market_close  # تأكد من استيرادها
 
+# The IBKR connection's sync calls may drive the loop re-entrantly; patch it once
 nest_asyncio.apply()
 
 NEWS_API_KEY = "Enter your News API Key"
 POSITIVE_NEWS_FILE = "data/positive_watchlist.json"
+NEWS_CACHE_FILE = "data/news_cache.sqlite"
+NEWS_CACHE_TTL = 3600  # Seconds a news verdict is reused per symbol
 BOT_TOKEN = "ENTER YOUR TG BOT TOKEN"
+NEWS_CONCURRENCY = 16  # Max concurrent news API requests
+SPY_CACHE_TTL = 180  # Seconds a SPY lookup stays valid
+NEWS_KEYWORDS = (
+    ("bankruptcy", "negative"),
+    ("dilution", "negative"),
+    ("record revenue", "positive"),
+    ("strong earnings", "positive"),
+)
+
+# Single-pass keyword matcher for news titles (falls back to substring checks)
+try:
+    import ahocorasick
+    _NEWS_AUTOMATON = ahocorasick.Automaton()
+    for _keyword, _tag in NEWS_KEYWORDS:
+        _NEWS_AUTOMATON.add_word(_keyword, _tag)
+    _NEWS_AUTOMATON.make_automaton()
+except ImportError:
+    _NEWS_AUTOMATON = None
+
+# (expiry, prev_close, today_close) from the last SPY lookup
+_SPY_CACHE = None
+
+# Shared HTTP session so TCP/TLS connections and DNS lookups are reused across sweeps
+_http_session = None
+
+# On-disk news verdict cache, opened on first use
+_news_db = None
 
-os.makedirs("logs", exist_ok=True)
+ensure_dir("logs")
 
 logging.basicConfig(
     filename="logs/bot.log",
@@ -52,110 +84,167 @@ logging.basicConfig(
 def log(msg):
     print(msg)
     logging.info(msg)
-import pytz
-from datetime import datetime, timezone, timedelta
-from modules.auto_trader import log_action  # يمكن استخدام نفس نظام التسجيل
+
+def _load_json(path):
+    try:
+        with open(path, "rb") as f:
+            return json_loads(f.read())
+    except FileNotFoundError:
+        return []
+
+def _rotate(src, dst):
+    """Copy src over dst, leaving src in place; a missing src is not an error"""
+    try:
+        shutil.copy(src, dst)
+    except FileNotFoundError:
+        pass
+
+_NY = ZoneInfo("America/New_York")
+MARKET_OPEN_MINUTE = 9 * 60 + 30  # 9:30 AM
+MARKET_CLOSE_MINUTE = 16 * 60  # 4:00 PM
+
+@lru_cache(maxsize=1)
+def _market_open_in_bucket(bucket: int) -> bool:
+    """Market status for one 30-second bucket, shared by every caller in that window"""
+    ny_time = datetime.now(_NY)
+    if ny_time.weekday() >= 5:  # السوق مغلق في عطلة نهاية الأسبوع
+        return False
+    return MARKET_OPEN_MINUTE <= ny_time.hour * 60 + ny_time.minute < MARKET_CLOSE_MINUTE
 
 def is_market_open() -> bool:
     """
     تحقق إذا كان السوق الأمريكي مفتوحًا (9:30 AM - 4 PM بتوقيت نيويورك).
     تُستبدل الدالة القديمة التي كانت تستخدم UTC+3.
     """
-    ny_tz = pytz.timezone("America/New_York")
-    ny_time = datetime.now(ny_tz)
-    
-    if ny_time.weekday() >= 5:  # السوق مغلق في عطلة نهاية الأسبوع
-        return False
-    
-    market_open = (9, 30)  # 9:30 AM
-    market_close = (16, 0)  # 4:00 PM
-    
-    current_time = (ny_time.hour, ny_time.minute)
-    return market_open <= current_time < market_close
+    return _market_open_in_bucket(int(time.time() // 30))
 
 def is_market_weak() -> bool:
     """
     تحقق إذا كان السوق ضعيفًا (انخفاض SPY بأكثر من 1%).
     تبقى كما هي لأنها لا تعتمد على التوقيت المحلي.
     """
+    global _SPY_CACHE
+    now = time.monotonic()
+    if _SPY_CACHE and _SPY_CACHE[0] > now:
+        return _SPY_CACHE[2] < _SPY_CACHE[1] * 0.99
+
     try:
-        spy = yf.Ticker("SPY")
-        hist = spy.history(period="2d")
+        hist = yf.download("SPY", period="2d", progress=False, threads=False)
         if len(hist) >= 2:
-            prev_close = hist["Close"].iloc[-2]
-            today_close = hist["Close"].iloc[-1]
-            change_pct = (today_close - prev_close) / prev_close * 100
-            return change_pct < -1
+            # Newer yfinance returns one column per ticker, squeeze it back to a series
+            closes = hist["Close"].squeeze()
+            prev_close = float(closes.iloc[-2])
+            today_close = float(closes.iloc[-1])
+            _SPY_CACHE = (now + SPY_CACHE_TTL, prev_close, today_close)
+            return today_close < prev_close * 0.99
     except Exception as e:
         log_action(f"❌ خطأ في تحليل SPY: {e}", "error")
     return False
 
-def fetch_news_sentiment(symbol):
+async def get_http_session():
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15))
+    return _http_session
+
+def get_news_db():
+    """Open the news verdict cache once, creating its table on first use"""
+    global _news_db
+    if _news_db is None:
+        ensure_dir(os.path.dirname(NEWS_CACHE_FILE))
+        _news_db = sqlite3.connect(NEWS_CACHE_FILE, check_same_thread=False)
+        _news_db.execute(
+            "CREATE TABLE IF NOT EXISTS news(sym TEXT, bucket INT, verdict TEXT, PRIMARY KEY(sym, bucket))"
+        )
+    return _news_db
+
+def _title_sentiment(title):
+    """Classify a lowercase title by its keywords; negative hits outrank positive ones"""
+    if _NEWS_AUTOMATON is not None:
+        tags = {tag for _, tag in _NEWS_AUTOMATON.iter(title)}
+    else:
+        tags = {tag for keyword, tag in NEWS_KEYWORDS if keyword in title}
+    if "negative" in tags:
+        return "negative"
+    if "positive" in tags:
+        return "positive"
+    return None
+
+async def fetch_news_sentiment(session, symbol):
+    db = get_news_db()
+    bucket = int(time.time() // NEWS_CACHE_TTL)
+    row = db.execute("SELECT verdict FROM news WHERE sym = ? AND bucket = ?", (symbol, bucket)).fetchone()
+    if row:
+        return row[0]
+
     try:
         url = f"https://api.marketaux.com/v1/news/all?symbols={symbol}&filter_entities=true&language=en&api_token={NEWS_API_KEY}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            articles = response.json().get("data", [])
-            for article in articles:
-                title = article.get("title", "").lower()
-                if "bankruptcy" in title or "dilution" in title:
-                    return "negative"
-                if "record revenue" in title or "strong earnings" in title:
-                    return "positive"
-        return "neutral"
+        async with session.get(url) as response:
+            if response.status != 200:
+                return "neutral"
+            articles = (await response.json()).get("data", [])
+
+        sentiment = "neutral"
+        for article in articles:
+            hit = _title_sentiment(article.get("title", "").lower())
+            if hit:
+                sentiment = hit
+                break
+        # Only successful lookups are cached, so failed requests are retried next sweep
+        db.execute("INSERT OR REPLACE INTO news VALUES (?, ?, ?)", (symbol, bucket, sentiment))
+        return sentiment
     except Exception as e:
         log(f"❌ خطأ في تحليل الأخبار لـ {symbol}: {e}")
         return "neutral"
 
-def watch_positive_news_stocks():
+async def watch_positive_news_stocks():
     log("🟢 فحص الأسهم ذات الأخبار الإيجابية...")
     try:
-        stocks = fetch_stocks_from_tradingview()
+        stocks = await asyncio.to_thread(fetch_stocks_from_tradingview)
         positive_stocks = []
 
-        old_symbols = []
-        if os.path.exists(POSITIVE_NEWS_FILE):
-            with open(POSITIVE_NEWS_FILE, "r", encoding="utf-8") as f:
-                old_list = json.load(f)
-            old_symbols = [s["symbol"] for s in old_list]
+        old_symbols = [s["symbol"] for s in _load_json(POSITIVE_NEWS_FILE)]
+
+        # Overlap the per-symbol requests, capped so the API isn't flooded
+        session = await get_http_session()
+        semaphore = asyncio.Semaphore(NEWS_CONCURRENCY)
+
+        async def bounded_fetch(symbol):
+            async with semaphore:
+                return await fetch_news_sentiment(session, symbol)
+
+        sentiments = await asyncio.gather(*(bounded_fetch(stock["symbol"]) for stock in stocks))
 
-        for stock in stocks:
+        # Persist this sweep's verdicts in one transaction and drop expired buckets
+        news_db = get_news_db()
+        news_db.execute("DELETE FROM news WHERE bucket < ?", (int(time.time() // NEWS_CACHE_TTL),))
+        news_db.commit()
+
+        for stock, sentiment in zip(stocks, sentiments):
             symbol = stock["symbol"]
-            sentiment = fetch_news_sentiment(symbol)
             if sentiment == "positive" and symbol not in old_symbols:
                 message = f"📢 سهم جديد بأخبار إيجابية:\n📈 {symbol}\n✅ تم رصده في السوق"
                 send_telegram_message(message)
                 positive_stocks.append(stock)
 
         if positive_stocks:
-            os.makedirs(os.path.dirname(POSITIVE_NEWS_FILE), exist_ok=True)
-            with open(POSITIVE_NEWS_FILE, "w", encoding="utf-8") as f:
-                json.dump(positive_stocks, f, indent=2, ensure_ascii=False)
+            ensure_dir(os.path.dirname(POSITIVE_NEWS_FILE))
+            with open(POSITIVE_NEWS_FILE, "wb") as f:
+                f.write(json_dumps(positive_stocks))
             log(f"✅ تم حفظ {len(positive_stocks)} سهم في قائمة الأخبار الإيجابية.")
         else:
             log("⚠️ لا توجد أسهم إيجابية حالياً.")
     except Exception as e:
         log(f"❌ فشل في مراقبة الأخبار الإيجابية: {e}")
 
-async def update_market_data(bot):
-    if not is_market_open():
-        log("⏸️ السوق مغلق - إلغاء التحديث")
-        return
-
+async def update_market_data():
     log("📊 تحليل وتحديث السوق...")
     try:
-        if os.path.exists("data/top_stocks.json"):
-            shutil.copy("data/top_stocks.json", "data/top_stocks_old.json")
-        if os.path.exists("data/pump_stocks.json"):
-            shutil.copy("data/pump_stocks.json", "data/pump_stocks_old.json")
-        if os.path.exists("data/high_movement_stocks.json"):
-            shutil.copy("data/high_movement_stocks.json", "data/high_movement_stocks_old.json")
-
+        _rotate("data/top_stocks.json", "data/top_stocks_old.json")
         await analyze_market()
         log("✅ تم تحليل السوق بنجاح.")
 
         compare_stock_lists_and_alert("data/top_stocks_old.json", "data/top_stocks.json", "🌀 سهم قوي جديد:")
-        await check_cross_list_movements(bot)
 
     except Exception as e:
         log(f"❌ فشل تحليل السوق: {e}")
@@ -171,13 +260,10 @@ async def update_symbols():
         log(f"❌ فشل تحديث الرموز: {e}")
 
 async def update_pump_stocks():
-    if not is_market_open():
-        return
     log("💣 تحليل الانفجارات السعرية...")
     try:
-        if os.path.exists("data/pump_stocks.json"):
-            shutil.copy("data/pump_stocks.json", "data/pump_stocks_old.json")
-        detect_pump_stocks()
+        _rotate("data/pump_stocks.json", "data/pump_stocks_old.json")
+        await asyncio.to_thread(detect_pump_stocks)
         log("✅ تم تحديث أسهم الانفجار.")
 
         compare_stock_lists_and_alert("data/pump_stocks_old.json", "data/pump_stocks.json", "💥 سهم انفجاري جديد:")
@@ -185,12 +271,9 @@ async def update_pump_stocks():
         log(f"❌ فشل تحليل الانفجارات: {e}")
 
 async def update_high_movement_stocks():
-    if not is_market_open():
-        return
     log("🚀 تحليل الأسهم ذات الحركة العالية...")
     try:
-        if os.path.exists("data/high_movement_stocks.json"):
-            shutil.copy("data/high_movement_stocks.json", "data/high_movement_stocks_old.json")
+        _rotate("data/high_movement_stocks.json", "data/high_movement_stocks_old.json")
         await asyncio.to_thread(analyze_high_movement_stocks)
         log("✅ تم تحديث أسهم الحركة العالية.")
 
@@ -198,6 +281,23 @@ async def update_high_movement_stocks():
     except Exception as e:
         log(f"❌ فشل تحليل الأسهم ذات الحركة العالية: {e}")
 
+async def analyze_all_5min(bot):
+    """Run the market, pump and high-movement analyses concurrently in one pass"""
+    if not is_market_open():
+        log("⏸️ السوق مغلق - إلغاء التحديث")
+        return
+    await asyncio.gather(
+        update_market_data(),
+        update_pump_stocks(),
+        update_high_movement_stocks(),
+    )
+
+    # Compare lists only once all three analyzers have finished writing them
+    try:
+        await check_cross_list_movements(bot)
+    except Exception as e:
+        log(f"❌ فشل مقارنة القوائم: {e}")
+
 async def track_targets(bot):
     log("🎯 متابعة لحظية للأسهم...")
     try:
@@ -222,44 +322,56 @@ async def daily_model_training():
     except Exception as e:
         log(f"❌ فشل تدريب النموذج: {e}")
 
+async def _periodic(name, interval_s, factory):
+    """Run factory() every interval_s seconds on monotonic deadlines, without drift"""
+    deadline = time.monotonic()
+    while True:
+        deadline = max(deadline + interval_s, time.monotonic())
+        await asyncio.sleep(deadline - time.monotonic())
+        try:
+            await factory()
+        except Exception as e:
+            log(f"❌ فشل تنفيذ المهمة {name}: {e}")
+
+async def _daily(name, at, factory):
+    """Run factory() once a day at local wall-clock time HH:MM"""
+    hour, minute = map(int, at.split(":"))
+    while True:
+        now = datetime.now()
+        target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if target <= now:
+            target += timedelta(days=1)
+        await asyncio.sleep((target - now).total_seconds())
+        try:
+            await factory()
+        except Exception as e:
+            log(f"❌ فشل تنفيذ المهمة {name}: {e}")
+
 async def main():
     bot_instance = Bot(token=BOT_TOKEN)
     
     asyncio.create_task(scheduled_tasks(bot_instance))
 
     await daily_model_training()
-    await update_market_data(bot_instance)
-    await update_pump_stocks()
-    await update_high_movement_stocks()
+    await analyze_all_5min(bot_instance)
     
-    schedule.every().day.at("00:00").do(lambda: asyncio.create_task(daily_model_training()))
-    schedule.every().day.at("03:00").do(lambda: asyncio.create_task(update_symbols()))
-    schedule.every(5).minutes.do(lambda: asyncio.create_task(update_market_data(bot_instance)))
-    schedule.every(5).minutes.do(lambda: asyncio.create_task(update_pump_stocks()))
-    schedule.every(5).minutes.do(lambda: asyncio.create_task(update_high_movement_stocks()))
-    schedule.every(5).minutes.do(lambda: asyncio.create_task(track_targets(bot_instance)))
-    schedule.every(10).minutes.do(watch_positive_news_stocks)
-    schedule.every().day.at("20:00").do(lambda: asyncio.create_task(send_daily_report_task()))
-    schedule.every().day.at("00:05").do(lambda: asyncio.create_task(clean_trade_history_task())) # داخل دالة main():
-    schedule.every(15).minutes.do(lambda: asyncio.create_task(send_pnl_summary(bot_instance)))
-    schedule.every().day.at("15:50").do(lambda: asyncio.create_task(close_all_positions_before_market_close(bot_instance)))
-    schedule.every(1).minutes.do(lambda: asyncio.run(verify_active_stop_orders()))
-
-
-
-    
-    async def keep_running_schedules():
-        while True:
-            schedule.run_pending()
-            await asyncio.sleep(30)
-
-    await asyncio.gather(
-        start_telegram_bot(),
-        keep_running_schedules()
-    )
+    try:
+        await asyncio.gather(
+            start_telegram_bot(),
+            _daily("daily_model_training", "00:00", daily_model_training),
+            _daily("update_symbols", "03:00", update_symbols),
+            _periodic("analyze_all_5min", 300, lambda: analyze_all_5min(bot_instance)),
+            _periodic("track_targets", 300, lambda: track_targets(bot_instance)),
+            _periodic("watch_positive_news_stocks", 600, watch_positive_news_stocks),
+            _daily("send_daily_report_task", "20:00", send_daily_report_task),
+            _daily("clean_trade_history_task", "00:05", clean_trade_history_task),
+            _periodic("send_pnl_summary", 900, lambda: send_pnl_summary(bot_instance)),
+            _daily("close_all_positions_before_market_close", "15:50", lambda: close_all_positions_before_market_close(bot_instance)),
+            _periodic("verify_active_stop_orders", 60, verify_active_stop_orders),
+        )
+    finally:
+        if _http_session is not None and not _http_session.closed:
+            await _http_session.close()
 
 if __name__ == "__main__":
-    import nest_asyncio
-    nest_asyncio.apply()
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(main())
+    asyncio.run(main())